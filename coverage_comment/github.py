@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import io
-import json
 import pathlib
 import sys
+import tempfile
+import weakref
 import zipfile
 
 from coverage_comment import github_client, log
 
 GITHUB_ACTIONS_LOGIN = "github-actions[bot]"
+# Artifacts smaller than this are kept in memory, bigger ones are spooled to disk
+ARTIFACT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Characters to escape in workflow commands, translated in a single pass
+_DATA_TRANSLATION_TABLE = str.maketrans({"%": "%25", "\r": "%0D", "\n": "%0A"})
+_PROPERTY_TRANSLATION_TABLE = str.maketrans(
+    {"%": "%25", "\r": "%0D", "\n": "%0A", ":": "%3A", ",": "%2C"}
+)
 
 
 class CannotDeterminePR(Exception):
@@ -36,6 +46,9 @@ class RepositoryInfo:
         return self.visibility == "public"
 
 
+# Repository info and login don't change during a run, so they're only
+# fetched once per client.
+@functools.cache
 def get_repository_info(
     github: github_client.GitHub, repository: str
 ) -> RepositoryInfo:
@@ -46,32 +59,89 @@ def get_repository_info(
     )
 
 
-def download_artifact(
+@functools.lru_cache(maxsize=4)
+def _open_artifact_zip(
     github: github_client.GitHub,
     repository: str,
     artifact_name: str,
     run_id: int,
-    filename: pathlib.Path,
-) -> str:
+) -> zipfile.ZipFile:
+    """
+    Download an artifact and open it as a zip file. The ZipFile is cached and
+    kept open, so that reading several files from the same artifact downloads
+    it and parses its central directory only once.
+    """
     repo_path = github.repos(repository)
     artifacts = repo_path.actions.runs(run_id).artifacts.get().artifacts
-    try:
-        artifact = next(
-            iter(artifact for artifact in artifacts if artifact.name == artifact_name),
-        )
-    except StopIteration:
+    artifacts_by_name = {artifact.name: artifact for artifact in artifacts}
+    artifact = artifacts_by_name.get(artifact_name)
+    if artifact is None:
         raise NoArtifact(
             f"Not artifact found with name {artifact_name} in run {run_id}"
         )
 
-    zip_bytes = io.BytesIO(repo_path.actions.artifacts(artifact.id).zip.get(bytes=True))
-    zipf = zipfile.ZipFile(zip_bytes)
+    chunks = repo_path.actions.artifacts(artifact.id).zip.get(stream=True)
 
+    spool = tempfile.SpooledTemporaryFile(max_size=ARTIFACT_SPOOL_MAX_SIZE)
     try:
-        return zipf.open(str(filename), "r").read().decode("utf-8")
+        for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+
+        zipf = zipfile.ZipFile(spool)
+    except Exception:
+        spool.close()
+        raise
+
+    # ZipFile doesn't close file objects it was given, so close the spool once
+    # the ZipFile is evicted from the cache and collected.
+    weakref.finalize(zipf, spool.close)
+    return zipf
+
+
+def open_artifact_member(
+    github: github_client.GitHub,
+    repository: str,
+    artifact_name: str,
+    run_id: int,
+    filename: pathlib.Path,
+) -> io.TextIOWrapper:
+    """
+    Open a file from an artifact in text mode. The file is decompressed and
+    decoded as it's read, so it can be processed before it's fully
+    decompressed.
+    """
+    zipf = _open_artifact_zip(
+        github=github,
+        repository=repository,
+        artifact_name=artifact_name,
+        run_id=run_id,
+    )
+    try:
+        member = zipf.open(str(filename), "r")
     except KeyError:
         raise NoArtifact(f"File named {filename} not found in artifact {artifact_name}")
 
+    # newline="" keeps line endings untouched (e.g. CRLF from Windows runners)
+    return io.TextIOWrapper(member, encoding="utf-8", newline="")
+
+
+def download_artifact(
+    github: github_client.GitHub,
+    repository: str,
+    artifact_name: str,
+    run_id: int,
+    filename: pathlib.Path,
+) -> str:
+    with open_artifact_member(
+        github=github,
+        repository=repository,
+        artifact_name=artifact_name,
+        run_id=run_id,
+        filename=filename,
+    ) as file:
+        return file.read()
+
 
 def get_branch_from_workflow_run(
     github: github_client.GitHub, repository: str, run_id: int
@@ -92,33 +162,21 @@ def find_pr_for_branch(
 
     full_branch = f"{owner}:{branch}"
 
-    common_kwargs = {"head": full_branch, "sort": "updated", "direction": "desc"}
-    try:
-        return next(
-            iter(
-                pr.number
-                for pr in github.repos(repository).pulls.get(
-                    state="open", **common_kwargs
-                )
-            )
-        )
-    except StopIteration:
-        pass
+    # PRs in all states are fetched at once, the open ones are picked among them
+    prs = github.repos(repository).pulls.get(
+        head=full_branch, state="all", sort="updated", direction="desc"
+    )
+    open_prs = [pr for pr in prs if pr.state == "open"]
+    if open_prs:
+        return open_prs[0].number
     log.info(f"No open PR found for branch {branch}, defaulting to all PRs")
 
-    try:
-        return next(
-            iter(
-                pr.number
-                for pr in github.repos(repository).pulls.get(
-                    state="all", **common_kwargs
-                )
-            )
-        )
-    except StopIteration:
+    if not prs:
         raise CannotDeterminePR(f"No open PR found for branch {branch}")
+    return prs[0].number
 
 
+@functools.cache
 def get_my_login(github: github_client.GitHub) -> str:
     try:
         response = github.user.get()
@@ -140,10 +198,15 @@ def post_comment(
     contents: str,
     marker: str,
 ) -> None:
-    issue_comments_path = github.repos(repository).issues(pr_number).comments
-    comments_path = github.repos(repository).issues.comments
-
-    for comment in issue_comments_path.get():
+    issues_path = github.repos(repository).issues
+    issue_comments_path = issues_path(pr_number).comments
+    comments_path = issues_path.comments
+
+    # The comments endpoint can't filter on the author, and the search API only
+    # returns issues (with an index that may lag behind, which would lead to
+    # duplicate comments), so filtering on the author is done here. Pagination
+    # is lazy, so we stop fetching pages as soon as the comment is found.
+    for comment in issue_comments_path.paginate(per_page=100):
         if comment.user.login == me and marker in comment.body:
             log.info("Update previous comment")
             try:
@@ -161,23 +224,20 @@ def post_comment(
 
 def set_output(github_output: pathlib.Path | None, **kwargs: bool) -> None:
     if github_output:
+        # Outputs are all booleans, serialized like JSON does (true/false)
+        payload = "".join(
+            f"{key}={'true' if value else 'false'}\n" for key, value in kwargs.items()
+        )
         with github_output.open("a") as f:
-            for key, value in kwargs.items():
-                f.write(f"{key}={json.dumps(value)}\n")
+            f.write(payload)
 
 
 def escape_property(s: str) -> str:
-    return (
-        s.replace("%", "%25")
-        .replace("\r", "%0D")
-        .replace("\n", "%0A")
-        .replace(":", "%3A")
-        .replace(",", "%2C")
-    )
+    return s.translate(_PROPERTY_TRANSLATION_TABLE)
 
 
 def escape_data(s: str) -> str:
-    return s.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+    return s.translate(_DATA_TRANSLATION_TABLE)
 
 
 def get_workflow_command(command: str, command_value: str, **kwargs: str) -> str:
@@ -185,19 +245,39 @@ def get_workflow_command(command: str, command_value: str, **kwargs: str) -> str
     Returns a string that can be printed to send a workflow command
     https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions
     """
-    values_listed = [f"{key}={escape_property(value)}" for key, value in kwargs.items()]
+    parts = ["::", command]
+    if kwargs:
+        parts.append(" ")
+        parts.append(
+            ",".join(f"{key}={escape_property(value)}" for key, value in kwargs.items())
+        )
+    parts.append("::")
+    parts.append(escape_data(command_value))
+    return "".join(parts)
 
-    context = f" {','.join(values_listed)}" if values_listed else ""
-    return f"::{command}{context}::{escape_data(command_value)}"
+
+def write_workflow_commands(*commands: str) -> None:
+    """
+    Write workflow commands to stderr, encoded once and sent to the underlying
+    binary buffer.
+    """
+    # Flush whatever was written in text mode (e.g. logs) to keep the ordering
+    sys.stderr.flush()
+    sys.stderr.buffer.write(
+        "".join(f"{command}\n" for command in commands).encode("utf-8")
+    )
+    sys.stderr.buffer.flush()
 
 
 def send_workflow_command(command: str, command_value: str, **kwargs: str) -> None:
-    print(
-        get_workflow_command(command=command, command_value=command_value, **kwargs),
-        file=sys.stderr,
+    write_workflow_commands(
+        get_workflow_command(command=command, command_value=command_value, **kwargs)
     )
 
 
+MISSING_COVERAGE_TITLE = escape_property("Missing coverage")
+
+
 def create_missing_coverage_annotations(
     annotation_type: str, annotations: list[tuple[pathlib.Path, int, int]]
 ):
@@ -206,27 +286,35 @@ def create_missing_coverage_annotations(
 
     annotation_type: The type of annotation to create. Can be either "error" or "warning".
     annotations: A list of tuples of the form (file, line_start, line_end)
+
+    Missing lines are expected to be already grouped into ranges (see
+    diff_grouper), so that each range results in a single annotation using
+    the line & endLine properties.
     """
-    send_workflow_command(
-        command="group", command_value="Annotations of lines with missing coverage"
-    )
+    # All the commands are written at once rather than one write per line
+    commands = [
+        get_workflow_command(
+            command="group", command_value="Annotations of lines with missing coverage"
+        )
+    ]
     for file, line_start, line_end in annotations:
         if line_start == line_end:
             message = f"Missing coverage on line {line_start}"
         else:
             message = f"Missing coverage on lines {line_start}-{line_end}"
 
-        send_workflow_command(
-            command=annotation_type,
-            command_value=message,
-            # This will produce \ paths when running on windows.
-            # GHA doc is unclear whether this is right or not.
-            file=str(file),
-            line=str(line_start),
-            endLine=str(line_end),
-            title="Missing coverage",
+        # Same as get_workflow_command, but only the file needs escaping: the
+        # title is escaped once and for all, and the line numbers and message
+        # never contain characters that need escaping.
+        # This will produce \ paths when running on windows.
+        # GHA doc is unclear whether this is right or not.
+        commands.append(
+            f"::{annotation_type} file={escape_property(str(file))},"
+            f"line={line_start},endLine={line_end},"
+            f"title={MISSING_COVERAGE_TITLE}::{message}"
         )
-    send_workflow_command(command="endgroup", command_value="")
+    commands.append(get_workflow_command(command="endgroup", command_value=""))
+    write_workflow_commands(*commands)
 
 
 def append_to_file(content: str, filepath: pathlib.Path):
@@ -12,9 +12,13 @@ from __future__ import annotations
 
 __version__ = "1.1.1"
 
+from collections.abc import Iterator
+
 import httpx
 
 TIMEOUT = 60
+# Size of the chunks yielded when streaming a response body
+CHUNK_SIZE = 64 * 1024
 
 _URL = "https://api.github.com"
 
@@ -40,6 +44,9 @@ class _Callable:
         name = "{}/{}".format(self._name, "/".join([str(arg) for arg in args]))
         return _Callable(self._gh, name)
 
+    def paginate(self, **kw):
+        return self._gh._paginate(self._name, **kw)
+
     def __getattr__(self, attr):
         if attr in ["get", "put", "post", "patch", "delete"]:
             return _Executable(self._gh, attr, self._name)
@@ -54,6 +61,10 @@ class GitHub:
 
     def __init__(self, session: httpx.Client):
         self.session = session
+        # Responses to GET requests, along with their ETag, keyed by request.
+        # Conditional requests answered with a 304 don't count against the
+        # rate limit.
+        self.etag_cache: dict[tuple, tuple[str, JsonObject | str | bytes]] = {}
 
     def __getattr__(self, attr):
         return _Callable(self, f"/{attr}")
@@ -64,6 +75,7 @@ class GitHub:
         path: str,
         *,
         bytes: bool = False,
+        stream: bool = False,
         headers: dict[str, str] | None = None,
         **kw,
     ):
@@ -76,6 +88,25 @@ class GitHub:
         elif _method in ["post", "patch", "put"]:
             requests_kwargs = {"json": kw}
 
+        if stream:
+            return self._stream(
+                _method.upper(), path, **header_kwargs, **requests_kwargs
+            )
+
+        cache_key = None
+        if _method == "get" and not bytes:
+            # The encoded query string supports any param value (e.g. lists),
+            # and headers such as Accept can change the returned representation.
+            cache_key = (
+                path,
+                str(httpx.QueryParams(kw)),
+                frozenset((headers or {}).items()),
+            )
+            if cached := self.etag_cache.get(cache_key):
+                header_kwargs = {
+                    "headers": (headers or {}) | {"If-None-Match": cached[0]}
+                }
+
         response = self.session.request(
             _method.upper(),
             path,
@@ -83,23 +114,68 @@ class GitHub:
             **header_kwargs,
             **requests_kwargs,
         )
+        if cache_key and response.status_code == 304:
+            return self.etag_cache[cache_key][1]
+
         if bytes:
             contents = response.content
         else:
             contents = response_contents(response)
 
-        try:
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            cls: type[ApiError] = {
-                403: Forbidden,
-                404: NotFound,
-            }.get(exc.response.status_code, ApiError)
+        raise_for_status(response=response, contents=contents)
 
-            raise cls(str(contents)) from exc
+        if cache_key and (etag := response.headers.get("etag")):
+            self.etag_cache[cache_key] = (etag, contents)
 
         return contents
 
+    def _paginate(self, path: str, **kw) -> Iterator[JsonObject]:
+        """
+        Yield the items of a paginated list. Next pages are only requested once
+        the previous ones have been consumed, so stopping the iteration early
+        saves the remaining requests.
+        """
+        url: str | None = path
+        params: dict | None = kw or None
+        while url:
+            response = self.session.request("GET", url, timeout=TIMEOUT, params=params)
+            if not response.is_success:
+                raise_for_status(
+                    response=response, contents=response_contents(response)
+                )
+
+            items: list[JsonObject] = response.json(object_hook=JsonObject)
+            yield from items
+
+            # The "next" URL already contains the query parameters
+            url = response.links.get("next", {}).get("url")
+            params = None
+
+    def _stream(self, method: str, path: str, **kwargs) -> Iterator[bytes]:
+        """
+        Yield the response body in chunks, without loading it fully in memory.
+        """
+        with self.session.stream(method, path, timeout=TIMEOUT, **kwargs) as response:
+            if response.is_error:
+                response.read()
+                raise_for_status(
+                    response=response, contents=response_contents(response)
+                )
+
+            yield from response.iter_bytes(chunk_size=CHUNK_SIZE)
+
+
+def raise_for_status(response: httpx.Response, contents: JsonObject | str | bytes):
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        cls: type[ApiError] = {
+            403: Forbidden,
+            404: NotFound,
+        }.get(exc.response.status_code, ApiError)
+
+        raise cls(str(contents)) from exc
+
 
 def response_contents(
     response: httpx.Response,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import concurrent.futures
 import functools
 import logging
 import os
@@ -33,10 +34,14 @@ def main():
         log.info("Starting action")
         config = settings.Config.from_environ(environ=os.environ)
 
+        # A single client is shared by all API calls, so that they reuse the
+        # same pooled connection(s) instead of paying a TLS handshake each time.
         github_session = httpx.Client(
             base_url="https://api.github.com",
             follow_redirects=True,
             headers={"Authorization": f"token {config.GITHUB_TOKEN}"},
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0),
         )
         http_session = httpx.Client()
         git = subprocess.Git()
@@ -274,13 +279,18 @@ def post_comment(
         log.error("Missing input GITHUB_PR_RUN_ID. Please consult the documentation.")
         return 1
 
-    me = github.get_my_login(github=gh)
     log.info(f"Search for PR associated with run id {config.GITHUB_PR_RUN_ID}")
-    owner, branch = github.get_branch_from_workflow_run(
-        github=gh,
-        run_id=config.GITHUB_PR_RUN_ID,
-        repository=config.GITHUB_REPOSITORY,
-    )
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        # Those calls are independent, let's not wait for one to launch the other
+        me_future = executor.submit(github.get_my_login, github=gh)
+        branch_future = executor.submit(
+            github.get_branch_from_workflow_run,
+            github=gh,
+            run_id=config.GITHUB_PR_RUN_ID,
+            repository=config.GITHUB_REPOSITORY,
+        )
+        me = me_future.result()
+        owner, branch = branch_future.result()
     try:
         pr_number = github.find_pr_for_branch(
             github=gh,
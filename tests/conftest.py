@@ -1,18 +1,20 @@
 from __future__ import annotations
 
+import contextlib
 import datetime
 import decimal
 import functools
 import io
 import os
 import pathlib
+import threading
 import zipfile
 
 import httpx
 import pytest
 
 from coverage_comment import coverage as coverage_module
-from coverage_comment import github_client, settings, subprocess
+from coverage_comment import github, github_client, settings, subprocess
 
 
 @pytest.fixture
@@ -74,6 +76,14 @@ def workflow_run_config(base_config):
     return _
 
 
+@pytest.fixture(autouse=True)
+def clear_github_caches():
+    yield
+    github._open_artifact_zip.cache_clear()
+    github.get_repository_info.cache_clear()
+    github.get_my_login.cache_clear()
+
+
 @pytest.fixture
 def session(is_failed):
     """
@@ -91,8 +101,14 @@ def session(is_failed):
     class Session:
         def __init__(self):
             self.responses = []  # List[Tuples[request kwargs, response kwargs]]
+            # The code may issue concurrent requests from several threads
+            self.lock = threading.Lock()
 
         def request(self, method, path, **kwargs):
+            with self.lock:
+                return self._request(method, path, **kwargs)
+
+        def _request(self, method, path, **kwargs):
             request_kwargs = {"method": method, "path": path} | kwargs
 
             for i, (match_kwargs, response_kwargs) in enumerate(self.responses):
@@ -121,6 +137,10 @@ def session(is_failed):
                     )
             assert False, f"No response found for kwargs {request_kwargs}\nExpected answers are {self.responses}"
 
+        @contextlib.contextmanager
+        def stream(self, method, path, **kwargs):
+            yield self.request(method, path, **kwargs)
+
         def __getattr__(self, value):
             if value in ["get", "post", "patch", "delete", "put"]:
                 return functools.partial(self.request, value.upper())
@@ -141,6 +161,29 @@ def session(is_failed):
         assert not session.responses
 
 
+@pytest.fixture
+def register_find_pr(session):
+    """
+    Register the PR lookup made by github.find_pr_for_branch:
+        register_find_pr(repository="a/b", head="owner:branch", prs=[(1, "open")])
+    where prs are (number, state) tuples, most recently updated first.
+    """
+
+    def _(repository, head, prs):
+        session.register(
+            "GET",
+            f"/repos/{repository}/pulls",
+            params={
+                "head": head,
+                "state": "all",
+                "sort": "updated",
+                "direction": "desc",
+            },
+        )(json=[{"number": number, "state": state} for number, state in prs])
+
+    return _
+
+
 @pytest.fixture
 def gh(session):
     return github_client.GitHub(session=session)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
 import pathlib
+import sys
+import tempfile
+import zipfile
 
 import pytest
 
-from coverage_comment import github
+from coverage_comment import github, github_client
 
 
 @pytest.mark.parametrize(
@@ -46,6 +50,17 @@ def test_get_repository_info(gh, session):
     assert info == github.RepositoryInfo(default_branch="baz", visibility="public")
 
 
+def test_get_repository_info__cached(gh, session):
+    # Only one response registered
+    session.register("GET", "/repos/foo/bar")(
+        json={"default_branch": "baz", "visibility": "public"}
+    )
+
+    info = github.get_repository_info(github=gh, repository="foo/bar")
+
+    assert github.get_repository_info(github=gh, repository="foo/bar") is info
+
+
 def test_download_artifact(gh, session, zip_bytes):
     artifacts = [
         {"name": "bar", "id": 456},
@@ -70,6 +85,127 @@ def test_download_artifact(gh, session, zip_bytes):
     assert result == "bar"
 
 
+def test_download_artifact__line_endings(gh, session, zip_bytes):
+    session.register("GET", "/repos/foo/bar/actions/runs/123/artifacts")(
+        json={"artifacts": [{"name": "foo", "id": 789}]}
+    )
+    session.register("GET", "/repos/foo/bar/actions/artifacts/789/zip")(
+        content=zip_bytes(filename="foo.txt", content="a\r\nb\rc\n")
+    )
+
+    result = github.download_artifact(
+        github=gh,
+        repository="foo/bar",
+        artifact_name="foo",
+        run_id=123,
+        filename=pathlib.Path("foo.txt"),
+    )
+
+    assert result == "a\r\nb\rc\n"
+
+
+def test_download_artifact__several_files(gh, session):
+    session.register("GET", "/repos/foo/bar/actions/runs/123/artifacts")(
+        json={"artifacts": [{"name": "foo", "id": 789}]}
+    )
+
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, mode="w") as zipf:
+        zipf.writestr("foo.txt", "bar")
+        zipf.writestr("baz.txt", "qux")
+    # The artifact is only downloaded once
+    session.register("GET", "/repos/foo/bar/actions/artifacts/789/zip")(
+        content=file.getvalue()
+    )
+
+    results = [
+        github.download_artifact(
+            github=gh,
+            repository="foo/bar",
+            artifact_name="foo",
+            run_id=123,
+            filename=pathlib.Path(filename),
+        )
+        for filename in ["foo.txt", "baz.txt"]
+    ]
+
+    assert results == ["bar", "qux"]
+
+
+def test_open_artifact_member(gh, session, zip_bytes):
+    session.register("GET", "/repos/foo/bar/actions/runs/123/artifacts")(
+        json={"artifacts": [{"name": "foo", "id": 789}]}
+    )
+    session.register("GET", "/repos/foo/bar/actions/artifacts/789/zip")(
+        content=zip_bytes(filename="foo.txt", content="bar\r\nbaz\n")
+    )
+
+    with github.open_artifact_member(
+        github=gh,
+        repository="foo/bar",
+        artifact_name="foo",
+        run_id=123,
+        filename=pathlib.Path("foo.txt"),
+    ) as file:
+        assert list(file) == ["bar\r\n", "baz\n"]
+
+
+@pytest.fixture
+def spools(mocker):
+    """
+    List of the spooled temporary files created while downloading artifacts
+    """
+    created = []
+    spooled_temporary_file = tempfile.SpooledTemporaryFile
+
+    def spool(*args, **kwargs):
+        created.append(spooled_temporary_file(*args, **kwargs))
+        return created[-1]
+
+    mocker.patch("tempfile.SpooledTemporaryFile", spool)
+    return created
+
+
+def test_download_artifact__bad_zip(gh, session, spools):
+    session.register("GET", "/repos/foo/bar/actions/runs/123/artifacts")(
+        json={"artifacts": [{"name": "foo", "id": 789}]}
+    )
+    session.register("GET", "/repos/foo/bar/actions/artifacts/789/zip")(
+        content=b"not a zip"
+    )
+
+    with pytest.raises(zipfile.BadZipFile):
+        github.download_artifact(
+            github=gh,
+            repository="foo/bar",
+            artifact_name="foo",
+            run_id=123,
+            filename=pathlib.Path("foo.txt"),
+        )
+
+    (spool,) = spools
+    assert spool.closed
+
+
+def test_download_artifact__download_error(gh, session, spools):
+    session.register("GET", "/repos/foo/bar/actions/runs/123/artifacts")(
+        json={"artifacts": [{"name": "foo", "id": 789}]}
+    )
+    session.register("GET", "/repos/foo/bar/actions/artifacts/789/zip")(status_code=404)
+
+    with pytest.raises(github_client.NotFound):
+        github.download_artifact(
+            github=gh,
+            repository="foo/bar",
+            artifact_name="foo",
+            run_id=123,
+            filename=pathlib.Path("foo.txt"),
+        )
+
+    (spool,) = spools
+    assert spool.closed
+
+
 def test_download_artifact__no_artifact(gh, session):
     artifacts = [
         {"name": "bar", "id": 456},
@@ -124,15 +260,11 @@ def test_get_branch_from_workflow_run(gh, session):
     assert branch == "other"
 
 
-def test_find_pr_for_branch(gh, session):
-    params = {
-        "head": "someone:other",
-        "sort": "updated",
-        "direction": "desc",
-        "state": "open",
-    }
-    session.register("GET", "/repos/foo/bar/pulls", params=params)(
-        json=[{"number": 456}]
+def test_find_pr_for_branch(gh, register_find_pr):
+    register_find_pr(
+        repository="foo/bar",
+        head="someone:other",
+        prs=[(456, "open"), (123, "closed")],
     )
 
     result = github.find_pr_for_branch(
@@ -142,22 +274,12 @@ def test_find_pr_for_branch(gh, session):
     assert result == 456
 
 
-def test_find_pr_for_branch__no_open_pr(gh, session):
-    params = {
-        "head": "someone:other",
-        "sort": "updated",
-        "direction": "desc",
-    }
-    session.register(
-        "GET",
-        "/repos/foo/bar/pulls",
-        params=params | {"state": "open"},
-    )(json=[])
-    session.register(
-        "GET",
-        "/repos/foo/bar/pulls",
-        params=params | {"state": "all"},
-    )(json=[{"number": 456}])
+def test_find_pr_for_branch__open_pr_not_first(gh, register_find_pr):
+    register_find_pr(
+        repository="foo/bar",
+        head="someone:other",
+        prs=[(123, "closed"), (456, "open")],
+    )
 
     result = github.find_pr_for_branch(
         github=gh, repository="foo/bar", owner="someone", branch="other"
@@ -166,27 +288,31 @@ def test_find_pr_for_branch__no_open_pr(gh, session):
     assert result == 456
 
 
-def test_find_pr_for_branch__no_pr(gh, session):
-    params = {
-        "head": "someone:other",
-        "sort": "updated",
-        "direction": "desc",
-    }
-    session.register(
-        "GET",
-        "/repos/foo/bar/pulls",
-        params=params | {"state": "open"},
-    )(json=[])
-    session.register(
-        "GET",
-        "/repos/foo/bar/pulls",
-        params=params | {"state": "all"},
-    )(json=[])
+def test_find_pr_for_branch__no_open_pr(gh, register_find_pr, get_logs):
+    register_find_pr(
+        repository="foo/bar",
+        head="someone:other",
+        prs=[(456, "closed"), (123, "closed")],
+    )
+
+    result = github.find_pr_for_branch(
+        github=gh, repository="foo/bar", owner="someone", branch="other"
+    )
+
+    assert result == 456
+    assert get_logs("INFO", "No open PR found for branch other")
+
+
+def test_find_pr_for_branch__no_pr(gh, register_find_pr, get_logs):
+    register_find_pr(repository="foo/bar", head="someone:other", prs=[])
+
     with pytest.raises(github.CannotDeterminePR):
         github.find_pr_for_branch(
             github=gh, repository="foo/bar", owner="someone", branch="other"
         )
 
+    assert get_logs("INFO", "No open PR found for branch other")
+
 
 def test_get_my_login(gh, session):
     session.register("GET", "/user")(json={"login": "foo"})
@@ -196,6 +322,15 @@ def test_get_my_login(gh, session):
     assert result == "foo"
 
 
+def test_get_my_login__cached(gh, session):
+    # Only one response registered
+    session.register("GET", "/user")(json={"login": "foo"})
+
+    github.get_my_login(github=gh)
+
+    assert github.get_my_login(github=gh) == "foo"
+
+
 def test_get_my_login__github_bot(gh, session):
     session.register("GET", "/user")(status_code=403)
 
@@ -235,6 +370,33 @@ def test_post_comment__create(gh, session, get_logs, existing_comments):
     assert get_logs("INFO", "Adding new comment")
 
 
+def test_post_comment__update_next_page(gh, session, get_logs):
+    next_url = "https://api.github.com/repositories/1/issues/123/comments?page=2"
+    session.register(
+        "GET", "/repos/foo/bar/issues/123/comments", params={"per_page": 100}
+    )(
+        json=[{"user": {"login": "bar"}, "body": "Hey marker!", "id": 123}],
+        headers={"Link": f'<{next_url}>; rel="next"'},
+    )
+    session.register("GET", next_url)(
+        json=[{"user": {"login": "foo"}, "body": "Hey marker!", "id": 456}],
+    )
+    session.register(
+        "PATCH", "/repos/foo/bar/issues/comments/456", json={"body": "hi!"}
+    )()
+
+    github.post_comment(
+        github=gh,
+        me="foo",
+        repository="foo/bar",
+        pr_number=123,
+        contents="hi!",
+        marker="marker",
+    )
+
+    assert get_logs("INFO", "Update previous comment")
+
+
 def test_post_comment__create_error(gh, session):
     session.register("GET", "/repos/foo/bar/issues/123/comments")(json=[])
     session.register(
@@ -303,10 +465,24 @@ def test_set_output(output_file):
     assert output_file.read_text() == "foo=true\n"
 
 
+def test_set_output__several(output_file):
+    github.set_output(github_output=output_file, foo=True, bar=False)
+
+    assert output_file.read_text() == "foo=true\nbar=false\n"
+
+
 def test_set_output__empty():
     assert github.set_output(github_output=None, foo=True) is None
 
 
+def test_escape_property():
+    assert github.escape_property("a%b\rc\nd:e,f") == "a%25b%0Dc%0Ad%3Ae%2Cf"
+
+
+def test_escape_data():
+    assert github.escape_data("a%b\rc\nd:e,f") == "a%25b%0Dc%0Ad:e,f"
+
+
 def test_get_workflow_command():
     output = github.get_workflow_command(
         command="foo", command_value="bar", file="main.py", line="1", title="someTitle"
@@ -329,6 +505,13 @@ def test_send_workflow_command(capsys):
     assert output.err.strip() == "::foo file=main.py,line=1,title=someTitle::bar"
 
 
+def test_send_workflow_command__after_text(capsys):
+    print("some log", file=sys.stderr)
+    github.send_workflow_command(command="foo", command_value="bar")
+    output = capsys.readouterr()
+    assert output.err == "some log\n::foo::bar\n"
+
+
 def test_add_job_summary(summary_file):
     github.add_job_summary(
         content="[job summary part 1]\n", github_step_summary=summary_file
@@ -356,3 +539,16 @@ def test_annotations(capsys):
 ::endgroup::"""
     output = capsys.readouterr()
     assert output.err.strip() == expected
+
+
+def test_annotations__escaped_file(capsys):
+    github.create_missing_coverage_annotations(
+        annotation_type="warning",
+        annotations=[(pathlib.Path("code,base/code.py"), 1, 3)],
+    )
+
+    output = capsys.readouterr()
+    assert output.err.splitlines()[1] == (
+        "::warning file=code%2Cbase/code.py,line=1,endLine=3,title=Missing coverage"
+        "::Missing coverage on lines 1-3"
+    )
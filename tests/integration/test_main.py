@@ -341,7 +341,13 @@ def test_action__pull_request__post_comment(
 
 
 def test_action__push__non_default_branch(
-    push_config, session, in_integration_env, output_file, summary_file, git
+    push_config,
+    session,
+    in_integration_env,
+    output_file,
+    summary_file,
+    git,
+    register_find_pr,
 ):
     session.register("GET", "/repos/py-cov-action/foobar")(
         json={"default_branch": "main", "visibility": "public"}
@@ -356,16 +362,9 @@ def test_action__push__non_default_branch(
         "/repos/py-cov-action/foobar/contents/data.json",
     )(text=payload, headers={"content-type": "application/vnd.github.raw+json"})
 
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "state": "open",
-            "head": "py-cov-action:other",
-            "sort": "updated",
-            "direction": "desc",
-        },
-    )(json=[{"number": 2}])
+    register_find_pr(
+        repository="py-cov-action/foobar", head="py-cov-action:other", prs=[(2, "open")]
+    )
 
     # Who am I
     session.register("GET", "/user")(json={"login": "foo"})
@@ -430,7 +429,13 @@ def test_action__push__no_branch(
 
 
 def test_action__push__non_default_branch__no_pr(
-    push_config, session, in_integration_env, output_file, summary_file, git
+    push_config,
+    session,
+    in_integration_env,
+    output_file,
+    summary_file,
+    git,
+    register_find_pr,
 ):
     session.register("GET", "/repos/py-cov-action/foobar")(
         json={"default_branch": "main", "visibility": "public"}
@@ -445,26 +450,9 @@ def test_action__push__non_default_branch__no_pr(
         "/repos/py-cov-action/foobar/contents/data.json",
     )(text=payload, headers={"content-type": "application/vnd.github.raw+json"})
 
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "state": "open",
-            "head": "py-cov-action:other",
-            "sort": "updated",
-            "direction": "desc",
-        },
-    )(json=[])
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "state": "all",
-            "head": "py-cov-action:other",
-            "sort": "updated",
-            "direction": "desc",
-        },
-    )(json=[])
+    register_find_pr(
+        repository="py-cov-action/foobar", head="py-cov-action:other", prs=[]
+    )
 
     result = main.action(
         config=push_config(
@@ -738,7 +726,7 @@ def test_action__workflow_run__no_pr_number(
 
 
 def test_action__workflow_run__no_pr(
-    workflow_run_config, session, in_integration_env, get_logs
+    workflow_run_config, session, in_integration_env, get_logs, register_find_pr
 ):
     session.register("GET", "/repos/py-cov-action/foobar")(
         json={"default_branch": "main", "visibility": "public"}
@@ -751,26 +739,9 @@ def test_action__workflow_run__no_pr(
         }
     )
 
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "head": "bar/repo-name:branch",
-            "sort": "updated",
-            "direction": "desc",
-            "state": "open",
-        },
-    )(json=[])
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "head": "bar/repo-name:branch",
-            "sort": "updated",
-            "direction": "desc",
-            "state": "all",
-        },
-    )(json=[])
+    register_find_pr(
+        repository="py-cov-action/foobar", head="bar/repo-name:branch", prs=[]
+    )
 
     result = main.action(
         config=workflow_run_config(),
@@ -784,7 +755,7 @@ def test_action__workflow_run__no_pr(
 
 
 def test_action__workflow_run__no_artifact(
-    workflow_run_config, session, in_integration_env, get_logs
+    workflow_run_config, session, in_integration_env, get_logs, register_find_pr
 ):
     session.register("GET", "/repos/py-cov-action/foobar")(
         json={"default_branch": "main", "visibility": "public"}
@@ -797,16 +768,11 @@ def test_action__workflow_run__no_artifact(
         }
     )
 
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "head": "bar/repo-name:branch",
-            "sort": "updated",
-            "direction": "desc",
-            "state": "open",
-        },
-    )(json=[{"number": 456}])
+    register_find_pr(
+        repository="py-cov-action/foobar",
+        head="bar/repo-name:branch",
+        prs=[(456, "open")],
+    )
 
     session.register(
         "GET",
@@ -825,7 +791,13 @@ def test_action__workflow_run__no_artifact(
 
 
 def test_action__workflow_run__post_comment(
-    workflow_run_config, session, in_integration_env, get_logs, zip_bytes, summary_file
+    workflow_run_config,
+    session,
+    in_integration_env,
+    get_logs,
+    zip_bytes,
+    summary_file,
+    register_find_pr,
 ):
     session.register("GET", "/repos/py-cov-action/foobar")(
         json={"default_branch": "main", "visibility": "public"}
@@ -838,16 +810,11 @@ def test_action__workflow_run__post_comment(
         }
     )
 
-    session.register(
-        "GET",
-        "/repos/py-cov-action/foobar/pulls",
-        params={
-            "head": "bar/repo-name:branch",
-            "sort": "updated",
-            "direction": "desc",
-            "state": "open",
-        },
-    )(json=[{"number": 456}])
+    register_find_pr(
+        repository="py-cov-action/foobar",
+        head="bar/repo-name:branch",
+        prs=[(456, "open")],
+    )
 
     session.register(
         "GET",
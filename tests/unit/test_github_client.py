@@ -38,6 +38,103 @@ def test_github_client__get_headers(session, gh):
     assert gh.repos("a/b").issues().get(a=1, headers={"X-foo": "yay"}) == {"foo": "bar"}
 
 
+def test_github_client__get_etag(session, gh):
+    session.register("GET", "/repos/a/b", params={"a": 1})(
+        json={"foo": "bar"}, headers={"ETag": '"abc"'}
+    )
+    session.register(
+        "GET", "/repos/a/b", params={"a": 1}, headers={"If-None-Match": '"abc"'}
+    )(status_code=304)
+
+    assert gh.repos("a/b").get(a=1) == {"foo": "bar"}
+    assert gh.repos("a/b").get(a=1) == {"foo": "bar"}
+
+
+def test_github_client__get_etag_modified(session, gh):
+    session.register("GET", "/repos/a/b")(
+        json={"foo": "bar"}, headers={"ETag": '"abc"'}
+    )
+    session.register("GET", "/repos/a/b", headers={"If-None-Match": '"abc"'})(
+        json={"foo": "baz"}, headers={"ETag": '"def"'}
+    )
+    session.register("GET", "/repos/a/b", headers={"If-None-Match": '"def"'})(
+        status_code=304
+    )
+
+    assert gh.repos("a/b").get() == {"foo": "bar"}
+    assert gh.repos("a/b").get() == {"foo": "baz"}
+    assert gh.repos("a/b").get() == {"foo": "baz"}
+
+
+def test_github_client__paginate(session, gh):
+    next_url = "https://api.github.com/repos/a/b/issues?a=1&page=2"
+    session.register("GET", "/repos/a/b/issues", timeout=60, params={"a": 1})(
+        json=[{"foo": 1}, {"foo": 2}],
+        headers={"Link": f'<{next_url}>; rel="next"'},
+    )
+    session.register("GET", next_url, timeout=60)(json=[{"foo": 3}])
+
+    assert list(gh.repos("a/b").issues.paginate(a=1)) == [
+        {"foo": 1},
+        {"foo": 2},
+        {"foo": 3},
+    ]
+
+
+def test_github_client__paginate_lazy(session, gh):
+    next_url = "https://api.github.com/repos/a/b/issues?page=2"
+    session.register("GET", "/repos/a/b/issues")(
+        json=[{"foo": 1}],
+        headers={"Link": f'<{next_url}>; rel="next"'},
+    )
+
+    # The second page is never requested
+    assert next(gh.repos("a/b").issues.paginate()) == {"foo": 1}
+
+
+def test_github_client__paginate_error(session, gh):
+    session.register("GET", "/repos/a/b/issues")(
+        json={"foo": "bar"},
+        status_code=403,
+    )
+
+    with pytest.raises(github_client.Forbidden):
+        list(gh.repos("a/b").issues.paginate())
+
+
+def test_github_client__get_etag_headers(session, gh):
+    raw = {"Accept": "application/vnd.github.raw+json"}
+    session.register("GET", "/repos/a/b/contents/c", headers=raw)(
+        text="foo",
+        headers={"content-type": "application/vnd.github.raw+json", "ETag": '"abc"'},
+    )
+    session.register("GET", "/repos/a/b/contents/c")(
+        json={"content": "Zm9v"}, headers={"ETag": '"def"'}
+    )
+    # Each representation is cached separately
+    session.register(
+        "GET",
+        "/repos/a/b/contents/c",
+        headers=raw | {"If-None-Match": '"abc"'},
+    )(status_code=304)
+
+    assert gh.repos("a/b").contents("c").get(headers=raw) == "foo"
+    assert gh.repos("a/b").contents("c").get() == {"content": "Zm9v"}
+    assert gh.repos("a/b").contents("c").get(headers=raw) == "foo"
+
+
+def test_github_client__get_etag_list_params(session, gh):
+    session.register("GET", "/repos/a/b", params={"a": [1, 2]})(
+        json={"foo": "bar"}, headers={"ETag": '"abc"'}
+    )
+    session.register(
+        "GET", "/repos/a/b", params={"a": [1, 2]}, headers={"If-None-Match": '"abc"'}
+    )(status_code=304)
+
+    assert gh.repos("a/b").get(a=[1, 2]) == {"foo": "bar"}
+    assert gh.repos("a/b").get(a=[1, 2]) == {"foo": "bar"}
+
+
 def test_github_client__post_non_json(session, gh):
     session.register("POST", "/repos/a/b/issues", timeout=60, json={"a": 1})()
 
@@ -80,3 +177,24 @@ def test_github_client__get_error_non_json(session, gh):
         gh.repos.get()
 
     assert str(exc_info.value) == "b'{foobar'"
+
+
+def test_github_client__get_stream(session, gh, mocker):
+    mocker.patch("coverage_comment.github_client.CHUNK_SIZE", 3)
+    session.register("GET", "/repos/a/b/zip", timeout=60, params={"a": 1})(
+        content=b"foobar"
+    )
+
+    assert list(gh.repos("a/b").zip.get(a=1, stream=True)) == [b"foo", b"bar"]
+
+
+def test_github_client__get_stream_error(session, gh):
+    session.register("GET", "/repos/a/b/zip")(
+        json={"foo": "bar"},
+        status_code=404,
+    )
+
+    with pytest.raises(github_client.NotFound) as exc_info:
+        list(gh.repos("a/b").zip.get(stream=True))
+
+    assert str(exc_info.value) == "{'foo': 'bar'}"